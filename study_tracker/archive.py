@@ -0,0 +1,97 @@
+import json
+import os
+import struct
+import zlib
+
+# Bundle layout:
+#   MAGIC
+#   member data, each compressed on its own with zlib
+#   index: zlib-compressed JSON {name: [offset, compressed_size, size]}
+#   footer: index offset, index size, FOOTER_MAGIC
+# Compressing members separately lets a reader seek straight to one file
+# and inflate only that file, never the whole month.
+MAGIC = b'STBUNDLE1\n'
+FOOTER_MAGIC = b'STIX'
+FOOTER = struct.Struct('<QI4s')
+
+
+class BundleError(Exception):
+    pass
+
+
+def write_bundle(path, members):
+    """
+    Write members ({name: bytes}) to a bundle at path.
+
+    The bundle is written to a temporary file and moved into place, so an
+    interrupted compaction never leaves a truncated bundle behind.
+    """
+    index = {}
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        for name in sorted(members):
+            data = members[name]
+            compressed = zlib.compress(data, 9)
+            index[name] = [f.tell(), len(compressed), len(data)]
+            f.write(compressed)
+
+        index_offset = f.tell()
+        index_data = zlib.compress(json.dumps(index, sort_keys=True).encode('utf-8'), 9)
+        f.write(index_data)
+        f.write(FOOTER.pack(index_offset, len(index_data), FOOTER_MAGIC))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class BundleReader:
+    """Random access to the members of a bundle written by write_bundle"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self.index = self._read_index()
+        except Exception:
+            self._file.close()
+            raise
+
+    def _read_index(self):
+        f = self._file
+        if f.read(len(MAGIC)) != MAGIC:
+            raise BundleError(f"{self.path} is not a study data bundle")
+
+        f.seek(-FOOTER.size, os.SEEK_END)
+        index_offset, index_size, footer_magic = FOOTER.unpack(f.read(FOOTER.size))
+        if footer_magic != FOOTER_MAGIC:
+            raise BundleError(f"{self.path} has no index footer")
+
+        f.seek(index_offset)
+        return json.loads(zlib.decompress(f.read(index_size)).decode('utf-8'))
+
+    def names(self):
+        return sorted(self.index)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def read(self, name):
+        offset, compressed_size, size = self.index[name]
+        self._file.seek(offset)
+        data = zlib.decompress(self._file.read(compressed_size))
+        if len(data) != size:
+            raise BundleError(f"Corrupt member {name} in {self.path}")
+        return data
+
+    def read_all(self):
+        return {name: self.read(name) for name in self.index}
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,197 @@
+"""
+Per-frame cost of the landmark stage in FaceDetector.process_frame.
+
+Compares the original scalar code with the current feature stage, on its
+own and together with the classification and debug overlay each version
+draws on the frame. Frames run in sequence through one FeatureExtractor, so
+the cost of refreshing head pose every POSE_INTERVAL frames is averaged in.
+FaceMesh inference and the frame hand-off to it are the same for both
+versions and are not measured.
+
+The feature stage must cost no more per frame than the scalar code; the
+script exits with status 1 when it does. Past the feature stage both
+branches draw the same circles and text, so the branch comparison is
+reported but not checked: its difference is within putText noise. The new
+pose, eye-openness and gaze overlay lines are reported separately.
+
+Run from the study_tracker directory:
+    python benchmarks/bench_landmark_features.py [--frames N]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import timeit
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from landmark_features import POSE_INTERVAL, FeatureExtractor
+
+WIDTH, HEIGHT = 640, 480
+
+
+class Landmark:
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+class FaceLandmarks:
+    def __init__(self, landmarks):
+        self.landmark = landmarks
+
+
+def synthetic_faces(count, num_landmarks=468, seed=0):
+    """Plausible face meshes with a little jitter, like a tracked face"""
+    rng = random.Random(seed)
+    faces = []
+    for _ in range(count):
+        cx, cy = 0.5 + rng.uniform(-0.05, 0.05), 0.6 + rng.uniform(-0.05, 0.05)
+        landmarks = []
+        for i in range(num_landmarks):
+            angle = i * 2 * math.pi / num_landmarks
+            landmarks.append(Landmark(
+                cx + 0.15 * math.cos(angle) + rng.uniform(-0.005, 0.005),
+                cy + 0.2 * math.sin(angle) + rng.uniform(-0.005, 0.005),
+                rng.uniform(-0.05, 0.05)
+            ))
+        faces.append(FaceLandmarks(landmarks))
+    return faces
+
+
+def scalar_features(face_landmarks, w, h):
+    """The feature code process_frame used before the vectorized stage"""
+    nose_tip = face_landmarks.landmark[4]
+    left_eye = face_landmarks.landmark[33]
+    right_eye = face_landmarks.landmark[263]
+    forehead = face_landmarks.landmark[10]
+    chin = face_landmarks.landmark[152]
+
+    nose_x, nose_y = int(nose_tip.x * w), int(nose_tip.y * h)
+    left_eye_x, left_eye_y = int(left_eye.x * w), int(left_eye.y * h)
+    right_eye_x, right_eye_y = int(right_eye.x * w), int(right_eye.y * h)
+    forehead_y = int(forehead.y * h)
+    chin_y = int(chin.y * h)
+
+    vertical_ratio = (nose_y - forehead_y) / (chin_y - nose_y) if (chin_y - nose_y) > 0 else 0
+    left_dist = abs(left_eye_x - nose_x)
+    right_dist = abs(right_eye_x - nose_x)
+    horizontal_ratio = min(left_dist, right_dist) / max(left_dist, right_dist) if max(left_dist, right_dist) > 0 else 0
+    nose_position_ratio = nose_y / h
+    return (nose_x, nose_y), (left_eye_x, left_eye_y), (right_eye_x, right_eye_y), \
+        vertical_ratio, horizontal_ratio, nose_position_ratio
+
+
+def scalar_branch(frame, face_landmarks, w, h):
+    """Scalar features, classification and the original five-line overlay"""
+    nose, left_eye, right_eye, vertical_ratio, horizontal_ratio, nose_position_ratio = \
+        scalar_features(face_landmarks, w, h)
+    cv2.circle(frame, nose, 5, (0, 255, 0), -1)
+    cv2.circle(frame, left_eye, 3, (0, 0, 255), -1)
+    cv2.circle(frame, right_eye, 3, (0, 0, 255), -1)
+
+    looking_down = vertical_ratio > 0.85 and nose_position_ratio > 0.55
+    looking_straight = horizontal_ratio > 0.5
+
+    cv2.putText(frame, f"Vert ratio: {vertical_ratio:.2f}", (10, 110),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+    cv2.putText(frame, f"Horiz ratio: {horizontal_ratio:.2f}", (10, 130),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+    cv2.putText(frame, f"Nose Y pos: {nose_position_ratio:.2f}", (10, 150),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+    cv2.putText(frame, f"Looking down: {looking_down}", (10, 170),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+    cv2.putText(frame, f"Looking straight: {looking_straight}", (10, 190),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+    return looking_down and looking_straight
+
+
+def current_branch(extractor, frame, face_landmarks, w, h, pose_lines=True):
+    """Mirror of the current landmark branch in FaceDetector.process_frame"""
+    features = extractor.extract(face_landmarks, w, h)
+    cv2.circle(frame, (int(features.nose[0]), int(features.nose[1])), 5, (0, 255, 0), -1)
+    cv2.circle(frame, (int(features.left_eye[0]), int(features.left_eye[1])), 3, (0, 0, 255), -1)
+    cv2.circle(frame, (int(features.right_eye[0]), int(features.right_eye[1])), 3, (0, 0, 255), -1)
+
+    looking_down = features.vertical_ratio > 0.85 and features.nose_position_ratio > 0.55
+    looking_straight = features.horizontal_ratio > 0.5
+
+    cv2.putText(frame, f"Vert ratio: {features.vertical_ratio:.2f}", (10, 110),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+    cv2.putText(frame, f"Horiz ratio: {features.horizontal_ratio:.2f}", (10, 130),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+    cv2.putText(frame, f"Nose Y pos: {features.nose_position_ratio:.2f}", (10, 150),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+    cv2.putText(frame, f"Looking down: {looking_down}", (10, 170),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+    cv2.putText(frame, f"Looking straight: {looking_straight}", (10, 190),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+    if pose_lines:
+        cv2.putText(frame, f"Head pose: P {features.pitch:.0f} Y {features.yaw:.0f} R {features.roll:.0f}",
+                    (10, 210), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+        cv2.putText(frame, f"Eye openness: {features.eye_openness:.2f}", (10, 230),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+        cv2.putText(frame, f"Gaze: {features.gaze[0]:+.2f}, {features.gaze[1]:+.2f}", (10, 250),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+    return looking_down and looking_straight
+
+
+def per_frame_us(funcs, faces, repeat):
+    """
+    Best-of-repeat mean cost of one call of each func, in microseconds.
+    The funcs take turns in every round, so drift in machine load hits
+    all of them alike instead of deciding a comparison.
+    """
+    best = [math.inf] * len(funcs)
+    for _ in range(repeat):
+        for n, func in enumerate(funcs):
+            def run():
+                for face in faces:
+                    func(face)
+            best[n] = min(best[n], timeit.timeit(run, number=1))
+    return [cost / len(faces) * 1e6 for cost in best]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the landmark feature stage")
+    parser.add_argument('--frames', type=int, default=2000, help="synthetic frames per run")
+    parser.add_argument('--repeat', type=int, default=5, help="runs; the fastest one is reported")
+    args = parser.parse_args()
+
+    faces = synthetic_faces(args.frames)
+    frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+
+    extractor = FeatureExtractor()
+
+    names, funcs = zip(*[
+        ("scalar features", lambda f: scalar_features(f, WIDTH, HEIGHT)),
+        ("current features", lambda f: extractor.extract(f, WIDTH, HEIGHT)),
+        ("scalar branch + overlay", lambda f: scalar_branch(frame, f, WIDTH, HEIGHT)),
+        ("current branch + same overlay",
+         lambda f: current_branch(extractor, frame, f, WIDTH, HEIGHT, pose_lines=False)),
+        ("current branch + pose lines", lambda f: current_branch(extractor, frame, f, WIDTH, HEIGHT)),
+    ])
+    results = list(zip(names, per_frame_us(funcs, faces, args.repeat)))
+
+    print(f"{args.frames} frames, best of {args.repeat} runs, pose every {POSE_INTERVAL} frames")
+    for name, cost in results:
+        print(f"  {name:<30} {cost:8.2f} us/frame")
+
+    (_, scalar_cost), (_, current_cost) = results[0], results[1]
+    within_budget = current_cost <= scalar_cost
+    print(f"Feature stage: {current_cost:.2f} us vs {scalar_cost:.2f} us scalar "
+          f"({current_cost / scalar_cost:.2f}x) {'OK' if within_budget else 'OVER BUDGET'}")
+    print(f"Landmark branch with the same overlay: {results[3][1]:.2f} us vs {results[2][1]:.2f} us scalar "
+          f"({results[3][1] / results[2][1]:.2f}x)")
+    print(f"Pose, eye openness and gaze overlay lines: +{results[4][1] - results[3][1]:.2f} us")
+
+    return 0 if within_budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,408 @@
+"""
+Persistence and reporting benchmarks for DataManager at multi-year scale.
+
+Generates a synthetic study history per user in a temporary directory,
+then measures startup load, export_stats, get_study_history and
+check_and_reset_weekly_stats on the raw one-file-per-day layout, the
+one-off archive compaction, and the same operations again on the
+compacted layout (where startup includes the app's compaction check).
+For each operation it records latency, files opened, bytes read and
+written, and peak Python memory.
+
+The raw phase also runs against older DataManager versions without
+data_dir or archive support, so results can be compared across versions;
+phases those versions cannot run are listed under meta.skipped.
+
+Run from the study_tracker directory:
+    python benchmarks/bench_persistence.py --years 5 --output new.json
+    python benchmarks/bench_persistence.py --years 5 --compare new.json
+
+--disk-latency-ms adds a fixed delay to every file open to mimic a slow disk.
+"""
+import argparse
+import contextlib
+import inspect
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_manager import DataManager
+
+ACCEPTS_DATA_DIR = 'data_dir' in inspect.signature(DataManager).parameters
+HAS_ARCHIVES = hasattr(DataManager, 'compact_archives')
+
+
+def format_duration(seconds):
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def write_weekly_stats(path, year, week, week_start, total_time, total_points, sessions, completed_on=None):
+    """Weekly stats file in the layout DataManager.export_stats writes"""
+    with open(path, 'w') as f:
+        f.write("===== WEEKLY STUDY STATISTICS =====\n\n")
+        f.write(f"Report generated: {week_start + timedelta(days=6):%Y-%m-%d} 21:00:00\n")
+        f.write(f"Week starting: {week_start:%Y-%m-%d}\n")
+        f.write(f"Year: {year}, Week number: {week}\n\n")
+        f.write(f"Total accumulated study time: {format_duration(total_time)}\n")
+        f.write(f"Total points earned: {total_points}\n")
+        f.write(f"Number of study sessions: {sessions}\n\n")
+        if completed_on:
+            f.write(f"\nWeek completed on: {completed_on:%Y-%m-%d} 21:00:00\n")
+
+
+def generate_history(user_dir, years, sessions_per_day, end=None, seed=0):
+    """
+    Write years of synthetic history ending on end (default today) into
+    user_dir: one session file per studied day holding that day's totals,
+    a completed weekly stats file per past week and a live one for the
+    current week. Returns the number of files written.
+    """
+    rng = random.Random(seed)
+    end = end or date.today()
+    day = end - timedelta(days=int(years * 365))
+    os.makedirs(user_dir, exist_ok=True)
+
+    files = 0
+    points = 0
+    week_key = None
+    week_totals = None
+    current_week = end.isocalendar()[:2]
+
+    def flush_week(week_key, totals):
+        year, week = week_key
+        week_start, total_time, total_points, sessions = totals
+        if week_key == current_week:
+            name, completed_on = f'weekly_stats_{year}_week{week}.txt', None
+        else:
+            name, completed_on = f'weekly_stats_{year}_week{week}_completed.txt', week_start + timedelta(days=7)
+        write_weekly_stats(os.path.join(user_dir, name), year, week, week_start,
+                           total_time, total_points, sessions, completed_on)
+
+    while day <= end:
+        year, week, _ = day.isocalendar()
+        if week_key != (year, week):
+            if week_key is not None:
+                flush_week(week_key, week_totals)
+                files += 1
+            week_key = (year, week)
+            week_totals = [day - timedelta(days=day.weekday()), 0, 0, 0]
+
+        # Skip roughly one day in five, like a real study habit
+        if rng.random() < 0.8:
+            study_time = sum(rng.uniform(600, 3600) for _ in range(sessions_per_day))
+            day_points = int(study_time) + 50 * rng.randint(0, sessions_per_day)
+            points += day_points
+            with open(os.path.join(user_dir, f'session_{day:%Y-%m-%d}.txt'), 'w') as f:
+                json.dump({
+                    'date': f'{day:%Y-%m-%d}',
+                    'study_time': study_time,
+                    'points': day_points,
+                    'level': points // 100 + 1
+                }, f, indent=4)
+            files += 1
+            week_totals[1] += int(study_time)
+            week_totals[2] += day_points
+            week_totals[3] += sessions_per_day
+        day += timedelta(days=1)
+
+    flush_week(week_key, week_totals)
+    return files + 1
+
+
+class IOCounter:
+    """
+    Counts file opens through an audit hook and, on Linux, bytes read and
+    written through /proc/self/io. The hook also injects the simulated
+    per-open disk latency.
+    """
+
+    def __init__(self, disk_latency):
+        self.disk_latency = disk_latency
+        self.slow_disk = False
+        self.active = False
+        self.opens = 0
+        sys.addaudithook(self._hook)
+
+    def _hook(self, event, args):
+        if event == 'open':
+            if self.active:
+                self.opens += 1
+            if self.slow_disk and self.disk_latency:
+                time.sleep(self.disk_latency)
+
+    @staticmethod
+    def _proc_io():
+        try:
+            with open('/proc/self/io', 'rb') as f:
+                fields = dict(line.split(b': ') for line in f.read().splitlines())
+            return int(fields[b'rchar']), int(fields[b'wchar'])
+        except (OSError, KeyError, ValueError):
+            return None
+
+    @contextlib.contextmanager
+    def measure(self, result):
+        before = self._proc_io()
+        self.opens = 0
+        self.active = True
+        try:
+            yield
+        finally:
+            self.active = False
+            after = self._proc_io()
+            result['files_opened'] = self.opens
+            if before and after:
+                result['bytes_read'] = after[0] - before[0]
+                result['bytes_written'] = after[1] - before[1]
+            else:
+                result['bytes_read'] = result['bytes_written'] = None
+
+
+def open_manager(data_dir):
+    if ACCEPTS_DATA_DIR:
+        return DataManager(data_dir)
+    manager = DataManager()
+    manager.data_dir = data_dir
+    return manager
+
+
+def startup(data_dir):
+    open_manager(data_dir).load_session_data()
+
+
+def startup_with_compaction(data_dir):
+    """Startup as StudyTracker runs it once archives are supported"""
+    manager = open_manager(data_dir)
+    manager.compact_archives()
+    if hasattr(manager, 'get_daily_totals'):
+        manager.get_daily_totals()
+    manager.load_session_data()
+
+
+def export(data_dir):
+    open_manager(data_dir).export_stats(
+        study_time=1800,
+        points=120,
+        level=3,
+        session_start_time=datetime.now() - timedelta(minutes=30)
+    )
+
+
+def history(data_dir):
+    open_manager(data_dir).get_study_history()
+
+
+def weekly_reset(data_dir):
+    today = datetime.now()
+    year, week, _ = today.isocalendar()
+    open_manager(data_dir).check_and_reset_weekly_stats(year, week)
+
+
+def compaction(data_dir):
+    open_manager(data_dir).compact_archives()
+
+
+def run_operation(func, user_dirs, repeat, counter):
+    """Time func over every user directory, then take one instrumented pass"""
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            for user_dir in user_dirs:
+                start = time.perf_counter()
+                func(user_dir)
+                timings.append(time.perf_counter() - start)
+
+        # Memory and I/O from a separate pass so tracing does not skew timings
+        result = {}
+        tracemalloc.start()
+        with counter.measure(result):
+            func(user_dirs[0])
+        result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    result['seconds'] = {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'max': max(timings),
+    }
+    return result
+
+
+def run_one_off(func, user_dirs, counter):
+    """Operations that change the layout can only be measured once per user"""
+    timings = []
+    result = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        with counter.measure(result):
+            for user_dir in user_dirs:
+                start = time.perf_counter()
+                func(user_dir)
+                timings.append(time.perf_counter() - start)
+        result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    # Counters cover all users here; report them per user like run_operation
+    for key in ('files_opened', 'bytes_read', 'bytes_written'):
+        if result[key] is not None:
+            result[key] //= len(user_dirs)
+    result['seconds'] = {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'max': max(timings),
+    }
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(args):
+    counter = IOCounter(args.disk_latency_ms / 1000)
+    root = tempfile.mkdtemp(prefix='study_tracker_bench_', dir=args.tmp_dir)
+    try:
+        user_dirs = [os.path.join(root, f'user_{n}') for n in range(args.users)]
+        start = time.perf_counter()
+        files = sum(generate_history(user_dir, args.years, args.sessions_per_day, seed=n)
+                    for n, user_dir in enumerate(user_dirs))
+        data_bytes = sum(os.path.getsize(os.path.join(user_dir, name))
+                         for user_dir in user_dirs for name in os.listdir(user_dir))
+        generation_time = time.perf_counter() - start
+
+        operations = [
+            ('export_stats', export),
+            ('get_study_history', history),
+            ('check_and_reset_weekly_stats', weekly_reset),
+        ]
+        results = {'raw': {}}
+        skipped = []
+        counter.slow_disk = True
+        results['raw']['startup'] = run_operation(startup, user_dirs, args.repeat, counter)
+        for name, func in operations:
+            results['raw'][name] = run_operation(func, user_dirs, args.repeat, counter)
+
+        if HAS_ARCHIVES:
+            results['compaction'] = run_one_off(compaction, user_dirs, counter)
+
+            results['archived'] = {}
+            results['archived']['startup'] = run_operation(startup_with_compaction, user_dirs, args.repeat, counter)
+            for name, func in operations:
+                results['archived'][name] = run_operation(func, user_dirs, args.repeat, counter)
+        else:
+            skipped = ['compaction', 'archived']
+    finally:
+        if args.keep:
+            print(f"Synthetic data kept in {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'years': args.years,
+            'sessions_per_day': args.sessions_per_day,
+            'users': args.users,
+            'repeat': args.repeat,
+            'disk_latency_ms': args.disk_latency_ms,
+            'files_per_user': files // args.users,
+            'bytes_per_user': data_bytes // args.users,
+            'generation_seconds': generation_time,
+            'skipped': skipped,
+        },
+        'results': results,
+    }
+
+
+def flatten(results):
+    rows = {}
+    for phase, operations in results.items():
+        if 'seconds' in operations:
+            rows[phase] = operations
+        else:
+            for name, metrics in operations.items():
+                rows[f'{phase}/{name}'] = metrics
+    return rows
+
+
+def print_results(report, baseline=None):
+    meta = report['meta']
+    print(f"{meta['users']} user(s), {meta['years']} years, {meta['sessions_per_day']} sessions/day, "
+          f"{meta['files_per_user']} files / {meta['bytes_per_user']} bytes per user, "
+          f"disk latency {meta['disk_latency_ms']} ms")
+    if meta.get('skipped'):
+        print(f"Skipped, not supported by this DataManager: {', '.join(meta['skipped'])}")
+    rows = flatten(report['results'])
+    old_rows = flatten(baseline['results']) if baseline else {}
+
+    header = f"{'operation':<40} {'median ms':>10} {'files':>7} {'read KB':>9} {'written KB':>10} {'peak KB':>9}"
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+    for name, metrics in rows.items():
+        def kb(value):
+            return f"{value / 1024:.1f}" if value is not None else "n/a"
+        line = (f"{name:<40} {metrics['seconds']['median'] * 1000:>10.2f} {metrics['files_opened']:>7} "
+                f"{kb(metrics['bytes_read']):>9} {kb(metrics['bytes_written']):>10} "
+                f"{kb(metrics['peak_memory_bytes']):>9}")
+        old = old_rows.get(name)
+        if baseline:
+            if old and old['seconds']['median'] > 0:
+                line += f" {metrics['seconds']['median'] / old['seconds']['median']:>7.2f}x"
+            else:
+                line += f" {'new':>8}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DataManager persistence at multi-year scale")
+    parser.add_argument('--years', type=float, default=3, help="years of synthetic history per user")
+    parser.add_argument('--sessions-per-day', type=int, default=3, help="study sessions on each studied day")
+    parser.add_argument('--users', type=int, default=1, help="number of per-user data directories")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per operation and user")
+    parser.add_argument('--disk-latency-ms', type=float, default=0, help="simulated delay per file open")
+    parser.add_argument('--tmp-dir', default=None, help="where to create the synthetic data (default: system temp)")
+    parser.add_argument('--keep', action='store_true', help="keep the synthetic data after the run")
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--compare', help="JSON results from an earlier run to compare against")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+    print_results(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,20 @@
 import os
 import json
-from datetime import datetime, timedelta
+import math
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+
+from archive import BundleReader, write_bundle
 
 class DataManager:
-    def __init__(self):
-        self.data_dir = os.path.join(os.path.dirname(__file__), 'study_data')
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir or os.path.join(os.path.dirname(__file__), 'study_data')
+        self.archive_dir = os.path.join(self.data_dir, 'archive')
+        self.summary_path = os.path.join(self.data_dir, 'history_summary.json')
+        self._daily_totals = None
+        # Saves come from both the auto-save thread and the exit path
+        self._totals_lock = threading.RLock()
         os.makedirs(self.data_dir, exist_ok=True)
     
     def save_session_data(self, data):
@@ -13,6 +23,8 @@ class DataManager:
         
         with open(file_path, 'w') as f:
             json.dump(data, f, indent=4)
+        
+        self._update_daily_totals(data.get('date', today), data.get('study_time', 0), data.get('points', 0))
     
     def load_session_data(self):
         today = datetime.now().strftime('%Y-%m-%d')
@@ -27,12 +39,58 @@ class DataManager:
         
         return None
     
-    def get_study_history(self):
+    def get_session_data(self, day):
+        """Session data for one 'YYYY-MM-DD' day, whether live or archived"""
+        filename = f'session_{day}.txt'
+        file_path = os.path.join(self.data_dir, filename)
+        
+        try:
+            if os.path.exists(file_path):
+                with open(file_path, 'r') as f:
+                    return json.load(f)
+            
+            bundle_path = self._archive_path(int(day[:4]), int(day[5:7]))
+            if os.path.exists(bundle_path):
+                with BundleReader(bundle_path) as bundle:
+                    if filename in bundle:
+                        return json.loads(bundle.read(filename))
+        except Exception as e:
+            print(f"Error loading session data for {day}: {e}")
+        
+        return None
+    
+    def get_study_history(self, start_date=None, end_date=None):
+        """
+        Session data keyed by date, optionally limited to the inclusive
+        'YYYY-MM-DD' range. Archived months are only opened when the range
+        reaches into them.
+        """
         history = {}
         
+        def in_range(day):
+            return (start_date is None or day >= start_date) and (end_date is None or day <= end_date)
+        
         try:
+            for (year, month), bundle_path in self._archived_months():
+                if (start_date and f'{year}-{month:02d}-31' < start_date) or \
+                        (end_date and f'{year}-{month:02d}-01' > end_date):
+                    continue
+                try:
+                    with BundleReader(bundle_path) as bundle:
+                        for name in bundle.names():
+                            if name.startswith('session_') and in_range(name[len('session_'):-len('.txt')]):
+                                session_data = json.loads(bundle.read(name))
+                                date = session_data.get('date')
+                                if date:
+                                    history[date] = session_data
+                except Exception as e:
+                    print(f"Error reading archive {bundle_path}: {e}")
+            
+            # Live files win over archived copies of the same day
             for filename in os.listdir(self.data_dir):
                 if filename.startswith('session_') and filename.endswith('.txt'):
+                    if not in_range(filename[len('session_'):-len('.txt')]):
+                        continue
                     file_path = os.path.join(self.data_dir, filename)
                     try:
                         with open(file_path, 'r') as f:
@@ -47,17 +105,227 @@ class DataManager:
             
         return history
     
+    def get_daily_totals(self):
+        """
+        Pre-aggregated {'YYYY-MM-DD': [study_time, points]} for every day on
+        record. Kept in history_summary.json and updated on each save, so
+        charts never have to read the per-day session files; the summary is
+        rebuilt from them (and the archives) only when it is missing.
+        StudyTracker loads it at startup, right after compaction, so that
+        rebuild never runs on the GUI thread.
+        """
+        totals = self._daily_totals
+        if totals is not None:
+            return totals
+        
+        with self._totals_lock:
+            if self._daily_totals is None:
+                totals = None
+                if os.path.exists(self.summary_path):
+                    try:
+                        with open(self.summary_path, 'r') as f:
+                            totals = json.load(f)['daily']
+                    except Exception as e:
+                        print(f"Error reading history summary, rebuilding it: {e}")
+                
+                if totals is None:
+                    totals = {
+                        day: [data.get('study_time', 0), data.get('points', 0)]
+                        for day, data in self.get_study_history().items()
+                    }
+                    self._write_daily_totals(totals)
+                self._daily_totals = totals
+            
+            return self._daily_totals
+    
+    def _update_daily_totals(self, day, study_time, points):
+        # The lock keeps concurrent saves from dropping each other's day or
+        # writing the summary out of order. The dict is replaced rather than
+        # mutated, so readers never need the lock.
+        with self._totals_lock:
+            totals = dict(self.get_daily_totals())
+            totals[day] = [study_time, points]
+            self._daily_totals = totals
+            self._write_daily_totals(totals)
+    
+    def _write_daily_totals(self, totals):
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix='history_summary_', suffix='.tmp', dir=self.data_dir)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'daily': totals}, f, sort_keys=True)
+            os.replace(tmp_path, self.summary_path)
+        except Exception as e:
+            print(f"Error writing history summary: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def get_history_series(self, period, max_bars=60, live_today=None, today=None):
+        """
+        Study time per bucket for the history charts as [(label, seconds)],
+        oldest first and ending with the bucket holding today.
+        
+        period is 'daily' (last 60 days), 'weekly' (last 52 weeks) or
+        'monthly' (everything on record). Series longer than max_bars are
+        downsampled: the newest bucket keeps its own bar and the older ones
+        are averaged in runs of neighbouring buckets, each labelled by its
+        first bucket. live_today overrides today's saved study time with
+        the tracker's current value.
+        """
+        today = today or date.today()
+        totals = self.get_daily_totals()
+        
+        if period == 'daily':
+            first = today - timedelta(days=59)
+            buckets = [first + timedelta(days=n) for n in range(60)]
+            bucket_of = lambda day: day
+            label = lambda day: day.strftime('%m-%d')
+        elif period == 'weekly':
+            first = today - timedelta(days=today.weekday(), weeks=51)
+            buckets = [first + timedelta(weeks=n) for n in range(52)]
+            bucket_of = lambda day: day - timedelta(days=day.weekday())
+            
+            def label(monday):
+                # ISO year, not the calendar year: 2025-12-29 starts W1 of 2026
+                year, week, _ = monday.isocalendar()
+                return f"W{week} {year % 100:02d}"
+        elif period == 'monthly':
+            earliest = min(totals) if totals else today.strftime('%Y-%m-%d')
+            year, month = int(earliest[:4]), int(earliest[5:7])
+            buckets = []
+            while (year, month) <= (today.year, today.month):
+                buckets.append(date(year, month, 1))
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+            bucket_of = lambda day: day.replace(day=1)
+            label = lambda first_day: first_day.strftime('%b %y')
+        else:
+            raise ValueError(f"Unknown history period: {period}")
+        
+        first_key = buckets[0].strftime('%Y-%m-%d')
+        values = dict.fromkeys(buckets, 0)
+        for day, (study_time, _) in totals.items():
+            if day >= first_key:
+                bucket = bucket_of(date.fromisoformat(day))
+                if bucket in values:
+                    values[bucket] += study_time
+        
+        if live_today is not None:
+            saved_today = totals.get(today.strftime('%Y-%m-%d'), [0, 0])[0]
+            values[bucket_of(today)] += live_today - saved_today
+        
+        series = [(label(bucket), values[bucket]) for bucket in buckets]
+        if len(series) <= max_bars:
+            return series
+        
+        # Groups are aligned to the end, so only the oldest one can be short
+        older, current = series[:-1], series[-1]
+        group_size = math.ceil(len(older) / max(max_bars - 1, 1))
+        downsampled = [current]
+        for end in range(len(older), 0, -group_size):
+            group = older[max(0, end - group_size):end]
+            downsampled.append((group[0][0], sum(seconds for _, seconds in group) / len(group)))
+        return downsampled[::-1]
+    
+    def _archive_path(self, year, month):
+        return os.path.join(self.archive_dir, f'study_data_{year}-{month:02d}.bundle')
+    
+    def _archived_months(self):
+        if not os.path.isdir(self.archive_dir):
+            return []
+        
+        months = []
+        for filename in os.listdir(self.archive_dir):
+            if filename.startswith('study_data_') and filename.endswith('.bundle'):
+                try:
+                    year, month = filename[len('study_data_'):-len('.bundle')].split('-')
+                    months.append(((int(year), int(month)), os.path.join(self.archive_dir, filename)))
+                except ValueError:
+                    continue
+        return sorted(months)
+    
+    @staticmethod
+    def _archive_month(filename):
+        """
+        (year, month) an archivable live file belongs to, or None. Completed
+        weekly stats go with the month their week ended in; the current
+        weekly stats file stays live until check_and_reset_weekly_stats
+        completes it.
+        """
+        try:
+            if filename.startswith('session_') and filename.endswith('.txt'):
+                day = datetime.strptime(filename[len('session_'):-len('.txt')], '%Y-%m-%d')
+                return day.year, day.month
+            if filename.startswith('weekly_stats_') and filename.endswith('_completed.txt'):
+                year, week = filename[len('weekly_stats_'):-len('_completed.txt')].split('_week')
+                week_end = date.fromisocalendar(int(year), int(week), 7)
+                return week_end.year, week_end.month
+        except ValueError:
+            pass
+        return None
+    
+    def compact_archives(self, today=None):
+        """
+        Pack the live files of every closed month into one compressed bundle
+        per month under archive/, so directory scans only see the current
+        month. Files are removed only after their bundle has been written and
+        read back.
+        """
+        today = today or datetime.now()
+        current_month = (today.year, today.month)
+        
+        try:
+            closed_months = {}
+            for filename in os.listdir(self.data_dir):
+                month = self._archive_month(filename)
+                if month and month < current_month:
+                    closed_months.setdefault(month, []).append(filename)
+            
+            if closed_months:
+                os.makedirs(self.archive_dir, exist_ok=True)
+            
+            for (year, month), filenames in sorted(closed_months.items()):
+                bundle_path = self._archive_path(year, month)
+                try:
+                    members = {}
+                    if os.path.exists(bundle_path):
+                        with BundleReader(bundle_path) as bundle:
+                            members.update(bundle.read_all())
+                    
+                    for filename in filenames:
+                        with open(os.path.join(self.data_dir, filename), 'rb') as f:
+                            members[filename] = f.read()
+                    
+                    write_bundle(bundle_path, members)
+                    with BundleReader(bundle_path) as bundle:
+                        for filename in filenames:
+                            if bundle.read(filename) != members[filename]:
+                                raise ValueError(f"{filename} did not round-trip")
+                    
+                    for filename in filenames:
+                        os.remove(os.path.join(self.data_dir, filename))
+                    print(f"Archived {len(filenames)} files for {year}-{month:02d}")
+                except Exception as e:
+                    print(f"Error archiving {year}-{month:02d}: {e}")
+        except Exception as e:
+            print(f"Error compacting study data: {e}")
+    
     def check_and_reset_weekly_stats(self, current_year, current_week):
         try:
             weekly_files = []
             for filename in os.listdir(self.data_dir):
-                if filename.startswith('weekly_stats_') and filename.endswith('.txt'):
+                # Completed weeks are done; picking one up here would overwrite and then delete it
+                if filename.startswith('weekly_stats_') and filename.endswith('.txt') \
+                        and not filename.endswith('_completed.txt'):
                     weekly_files.append(filename)
             
             if not weekly_files:
                 return
             
-            weekly_files.sort(reverse=True)
+            # Sort by (year, week) numerically: as strings "week9" sorts after "week10"
+            weekly_files.sort(
+                key=lambda name: [int(part.replace('week', '')) for part in name[len('weekly_stats_'):-len('.txt')].split('_')],
+                reverse=True
+            )
             
             last_file = weekly_files[0]
             parts = last_file.replace('weekly_stats_', '').replace('.txt', '').split('_')
@@ -152,7 +420,11 @@ class DataManager:
                 f.write(f"- Current level: {level}\n")
                 f.write(f"- Session started: {session_start_time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
                 
-                history_data = self.get_study_history()
+                week_start = today - timedelta(days=today.weekday())
+                history_data = self.get_study_history(
+                    start_date=week_start.strftime('%Y-%m-%d'),
+                    end_date=(week_start + timedelta(days=6)).strftime('%Y-%m-%d')
+                )
                 if history_data:
                     f.write("This Week's Study Sessions:\n")
                     for date, data in history_data.items():
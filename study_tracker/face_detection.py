@@ -3,10 +3,13 @@ import mediapipe as mp
 import time
 import numpy as np
 
+from landmark_features import FeatureExtractor
+
 class FaceDetector:
     def __init__(self, status_callback):
         self.status_callback = status_callback
         self.is_studying = False
+        self.feature_extractor = FeatureExtractor()
         
         # Initialize face mesh
         mp_face_mesh = mp.solutions.face_mesh
@@ -60,6 +63,8 @@ class FaceDetector:
     def process_frame(self, frame, time_diff):
         try:
             rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # Read-only input lets mediapipe share the buffer instead of copying the frame
+            rgb_frame.flags.writeable = False
             results = self.face_mesh.process(rgb_frame)
             
             previous_state = self.is_studying
@@ -68,44 +73,21 @@ class FaceDetector:
             if results.multi_face_landmarks:
                 face_landmarks = results.multi_face_landmarks[0]
                 
-                # Get key facial landmarks
-                nose_tip = face_landmarks.landmark[4]  # Nose tip
-                left_eye = face_landmarks.landmark[33]  # Left eye
-                right_eye = face_landmarks.landmark[263]  # Right eye
-                forehead = face_landmarks.landmark[10]  # Forehead
-                chin = face_landmarks.landmark[152]  # Chin
+                # Landmark features: ratios every frame, head pose, eye openness and gaze every few frames
+                features = self.feature_extractor.extract(face_landmarks, w, h)
                 
                 # Draw key points for debugging
-                nose_x, nose_y = int(nose_tip.x * w), int(nose_tip.y * h)
-                cv2.circle(frame, (nose_x, nose_y), 5, (0, 255, 0), -1)  # Green for nose
-                
-                left_eye_x, left_eye_y = int(left_eye.x * w), int(left_eye.y * h)
-                right_eye_x, right_eye_y = int(right_eye.x * w), int(right_eye.y * h)
-                cv2.circle(frame, (left_eye_x, left_eye_y), 3, (0, 0, 255), -1)  # Red for eyes
-                cv2.circle(frame, (right_eye_x, right_eye_y), 3, (0, 0, 255), -1)
-                
-                # Calculate vertical angle (looking up/down)
-                # When looking down, the nose-to-forehead distance increases relative to the nose-to-chin distance
-                forehead_y = int(forehead.y * h)
-                chin_y = int(chin.y * h)
-                
-                vertical_ratio = (nose_y - forehead_y) / (chin_y - nose_y) if (chin_y - nose_y) > 0 else 0
+                cv2.circle(frame, (int(features.nose[0]), int(features.nose[1])), 5, (0, 255, 0), -1)  # Green for nose
+                cv2.circle(frame, (int(features.left_eye[0]), int(features.left_eye[1])), 3, (0, 0, 255), -1)  # Red for eyes
+                cv2.circle(frame, (int(features.right_eye[0]), int(features.right_eye[1])), 3, (0, 0, 255), -1)
                 
-                # Calculate horizontal angle (looking left/right)
-                # We measure symmetry between left eye-nose and right eye-nose
-                left_dist = abs(left_eye_x - nose_x)
-                right_dist = abs(right_eye_x - nose_x)
-                horizontal_ratio = min(left_dist, right_dist) / max(left_dist, right_dist) if max(left_dist, right_dist) > 0 else 0
-                
-                # Additional check for nose position in frame - should be in lower half when looking down
-                nose_position_ratio = nose_y / h
-                is_nose_lower = nose_position_ratio > 0.55  # Nose should be in lower half of frame when looking down
+                is_nose_lower = features.nose_position_ratio > 0.55
                 
                 # Thresholds for classification - increased threshold for vertical detection
-                looking_down = vertical_ratio > 0.85 and is_nose_lower  # Made this stricter AND added position check
+                looking_down = features.vertical_ratio > 0.85 and is_nose_lower  # Made this stricter AND added position check
                 
                 # Tolerance for left/right movement
-                looking_straight = horizontal_ratio > 0.5
+                looking_straight = features.horizontal_ratio > 0.5
                 
                 # Determine if studying
                 if looking_down and looking_straight:
@@ -119,21 +101,29 @@ class FaceDetector:
                     self.is_studying = False
                 
                 # Display debug info
-                cv2.putText(frame, f"Vert ratio: {vertical_ratio:.2f}", (10, 110), 
+                cv2.putText(frame, f"Vert ratio: {features.vertical_ratio:.2f}", (10, 110), 
                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
-                cv2.putText(frame, f"Horiz ratio: {horizontal_ratio:.2f}", (10, 130), 
+                cv2.putText(frame, f"Horiz ratio: {features.horizontal_ratio:.2f}", (10, 130), 
                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
-                cv2.putText(frame, f"Nose Y pos: {nose_position_ratio:.2f}", (10, 150), 
+                cv2.putText(frame, f"Nose Y pos: {features.nose_position_ratio:.2f}", (10, 150), 
                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
                 cv2.putText(frame, f"Looking down: {looking_down}", (10, 170), 
                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
                 cv2.putText(frame, f"Looking straight: {looking_straight}", (10, 190), 
                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+                cv2.putText(frame, f"Head pose: P {features.pitch:.0f} Y {features.yaw:.0f} R {features.roll:.0f}",
+                          (10, 210), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+                cv2.putText(frame, f"Eye openness: {features.eye_openness:.2f}", (10, 230),
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+                cv2.putText(frame, f"Gaze: {features.gaze[0]:+.2f}, {features.gaze[1]:+.2f}", (10, 250),
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
                 
             else:
                 if self.is_studying:
                     print("No face detected, stopped studying")
                 self.is_studying = False
+                # A face that comes back gets a fresh pose on its first frame
+                self.feature_extractor.reset()
             
             # Call the callback with the current status
             self.status_callback(self.is_studying, time_diff)
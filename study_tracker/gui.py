@@ -3,9 +3,12 @@ from tkinter import ttk, PhotoImage
 import os
 from datetime import timedelta
 
+from history_view import HistoryView
+
 class StudyTrackerGUI:
     def __init__(self, tracker):
         self.tracker = tracker
+        self.history_view = None
         
         self.root = tk.Tk()  # We'll create a custom dark theme
         self.root.title("Study Tracker Pro")
@@ -139,6 +142,11 @@ class StudyTrackerGUI:
         self.export_button.pack(side=tk.RIGHT)
         self.create_tooltip(self.export_button, "Export your study data to a file")
         
+        self.history_button = ttk.Button(button_frame, text="View History",
+                                       command=self.open_history)
+        self.history_button.pack(side=tk.LEFT)
+        self.create_tooltip(self.history_button, "Daily, weekly and monthly study charts")
+        
         # Pomodoro frame
         pomo_frame = ttk.LabelFrame(main_container, text="Pomodoro Timer", padding="15")
         pomo_frame.pack(fill=tk.X, pady=15)
@@ -217,6 +225,12 @@ class StudyTrackerGUI:
         widget.bind("<Enter>", enter)
         widget.bind("<Leave>", leave)
     
+    def open_history(self):
+        if self.history_view is None:
+            self.history_view = HistoryView(self)
+        else:
+            self.history_view.lift()
+    
     def reset_timer(self):
         # This method would be implemented to reset the Pomodoro timer
         if hasattr(self.tracker.pomodoro, 'reset'):
@@ -233,12 +247,15 @@ class StudyTrackerGUI:
         self.skip_button["state"] = "disabled"
     
     def update_gui(self):
+        # Read one consistent snapshot of the tracker totals
+        snapshot = self.tracker.state.snapshot
+        
         # Update points and level
-        self.points_label.config(text=f"{self.tracker.points}")
-        self.level_label.config(text=f"{self.tracker.level}")
+        self.points_label.config(text=f"{snapshot.points}")
+        self.level_label.config(text=f"{snapshot.level}")
         
         # Update study time display
-        time_delta = timedelta(seconds=int(self.tracker.study_time))
+        time_delta = timedelta(seconds=int(snapshot.study_time))
         time_string = str(time_delta)
         if time_string.startswith('0:'):  # Remove leading '0:' for times less than 1 hour
             time_string = time_string[2:]
@@ -247,13 +264,13 @@ class StudyTrackerGUI:
         # Update progress bars
         # Level progress (assuming we know points needed for next level)
         points_for_level = 100  # This should be calculated based on current level
-        current_level_points = self.tracker.points % points_for_level
+        current_level_points = snapshot.points % points_for_level
         level_progress = (current_level_points / points_for_level) * 100
         self.level_progress["value"] = level_progress
         
         # Goal progress (assuming 2 hour daily goal)
         daily_goal_seconds = 7200  # 2 hours in seconds
-        daily_progress = min((self.tracker.study_time / daily_goal_seconds) * 100, 100)
+        daily_progress = min((snapshot.study_time / daily_goal_seconds) * 100, 100)
         self.goal_progress["value"] = daily_progress
         
         # Schedule the next update
@@ -0,0 +1,166 @@
+import math
+import tkinter as tk
+from tkinter import ttk
+
+class HistoryView:
+    """
+    Study history charts in their own window.
+
+    Bars are drawn on a Canvas from DataManager's pre-aggregated series. On
+    refresh only bars whose value changed are moved; the chart is rebuilt
+    only when the period, the buckets shown or the axis scale changes.
+    """
+
+    PERIODS = (("Daily", "daily"), ("Weekly", "weekly"), ("Monthly", "monthly"))
+    WIDTH = 420
+    HEIGHT = 260
+    MARGIN_LEFT = 40
+    MARGIN_BOTTOM = 24
+    MARGIN_TOP = 12
+    MIN_BAR_WIDTH = 6
+    REFRESH_MS = 5000
+
+    def __init__(self, gui):
+        self.gui = gui
+        self.tracker = gui.tracker
+        self.colors = gui.colors
+        self.period = "daily"
+        self.max_bars = (self.WIDTH - self.MARGIN_LEFT) // self.MIN_BAR_WIDTH
+
+        # Bars currently on the canvas as [item_id, seconds]
+        self.bars = []
+        self.layout = None
+        self.after_id = None
+
+        self.window = tk.Toplevel(gui.root)
+        self.window.title("Study History")
+        self.window.configure(bg=self.colors["bg"])
+        self.window.resizable(False, False)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.setup_view()
+        self.refresh()
+
+    def setup_view(self):
+        container = tk.Frame(self.window, bg=self.colors["bg"], padx=15, pady=15)
+        container.pack(fill=tk.BOTH, expand=True)
+
+        chart_frame = ttk.LabelFrame(container, text="Study History", padding="10")
+        chart_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Period selection
+        period_frame = ttk.Frame(chart_frame)
+        period_frame.pack(fill=tk.X, pady=(0, 10))
+
+        self.period_buttons = {}
+        for text, period in self.PERIODS:
+            button = ttk.Button(period_frame, text=text, style="Secondary.TButton",
+                                command=lambda period=period: self.show_period(period))
+            button.pack(side=tk.LEFT, padx=(0, 5))
+            self.period_buttons[period] = button
+
+        self.canvas = tk.Canvas(chart_frame, width=self.WIDTH, height=self.HEIGHT,
+                                bg=self.colors["frame_bg"], highlightthickness=0)
+        self.canvas.pack()
+
+        self.summary_label = ttk.Label(chart_frame, text="", style="TLabel")
+        self.summary_label.pack(anchor="w", pady=(10, 0))
+
+        self.update_period_buttons()
+
+    def update_period_buttons(self):
+        for period, button in self.period_buttons.items():
+            button["state"] = "disabled" if period == self.period else "normal"
+
+    def show_period(self, period):
+        self.period = period
+        self.update_period_buttons()
+        self.refresh(reschedule=False)
+
+    def refresh(self, reschedule=True):
+        if not self.window.winfo_exists():
+            return
+
+        series = self.tracker.data_manager.get_history_series(
+            self.period,
+            max_bars=self.max_bars,
+            live_today=self.tracker.state.snapshot.study_time
+        )
+        self.draw(series)
+
+        if reschedule:
+            self.after_id = self.window.after(self.REFRESH_MS, self.refresh)
+
+    @staticmethod
+    def axis_max(series):
+        # Whole hours, so small changes to the tallest bar don't rescale every bar
+        longest = max((seconds for _, seconds in series), default=0)
+        return max(1, math.ceil(longest / 3600)) * 3600
+
+    def bar_coords(self, index, seconds):
+        x0 = self.MARGIN_LEFT + index * self.bar_width
+        y0 = self.plot_bottom - (self.plot_bottom - self.MARGIN_TOP) * min(seconds / self.scale, 1)
+        return x0 + 1, y0, x0 + self.bar_width - 1, self.plot_bottom
+
+    def draw(self, series):
+        # Labels are part of the layout: when the series shifts to a new
+        # day the bar count stays the same but every x label moves on
+        layout = (self.period, tuple(label for label, _ in series), self.axis_max(series))
+        if layout != self.layout:
+            self.draw_chart(series, layout)
+        else:
+            for index, (_, seconds) in enumerate(series):
+                bar = self.bars[index]
+                if seconds != bar[1]:
+                    self.canvas.coords(bar[0], *self.bar_coords(index, seconds))
+                    bar[1] = seconds
+
+        total = sum(seconds for _, seconds in series)
+        average = total / len(series) if series else 0
+        self.summary_label.config(
+            text=f"Shown: {total / 3600:.1f} h total, {average / 3600:.1f} h average per bar"
+        )
+
+    def draw_chart(self, series, layout):
+        """Full redraw: axes, labels and every bar"""
+        self.layout = layout
+        self.scale = layout[2]
+        self.plot_bottom = self.HEIGHT - self.MARGIN_BOTTOM
+        self.bar_width = (self.WIDTH - self.MARGIN_LEFT) / max(len(series), 1)
+
+        canvas = self.canvas
+        canvas.delete("all")
+
+        # Y axis with hour gridlines
+        hours = self.scale // 3600
+        step = max(1, math.ceil(hours / 4))
+        for hour in range(0, hours + 1, step):
+            y = self.plot_bottom - (self.plot_bottom - self.MARGIN_TOP) * hour * 3600 / self.scale
+            canvas.create_line(self.MARGIN_LEFT, y, self.WIDTH, y, fill=self.colors["progress_bg"])
+            canvas.create_text(self.MARGIN_LEFT - 6, y, text=f"{hour}h", anchor="e",
+                               fill=self.colors["text"], font=("Helvetica", 8))
+
+        # A few X labels: first, middle and last bucket
+        for index in sorted({0, len(series) // 2, len(series) - 1}):
+            if 0 <= index < len(series):
+                x = self.MARGIN_LEFT + (index + 0.5) * self.bar_width
+                canvas.create_text(x, self.plot_bottom + 12, text=series[index][0],
+                                   fill=self.colors["text"], font=("Helvetica", 8))
+
+        self.bars = []
+        for index, (_, seconds) in enumerate(series):
+            # The newest bar is the current day/week/month
+            color = self.colors["highlight"] if index == len(series) - 1 else self.colors["accent"]
+            item = canvas.create_rectangle(*self.bar_coords(index, seconds), fill=color, width=0)
+            self.bars.append([item, seconds])
+
+    def lift(self):
+        self.window.deiconify()
+        self.window.lift()
+
+    def close(self):
+        if self.after_id is not None:
+            self.window.after_cancel(self.after_id)
+            self.after_id = None
+        self.window.destroy()
+        self.gui.history_view = None
@@ -0,0 +1,162 @@
+import math
+from collections import namedtuple
+
+# Face mesh landmark indices used by the feature stage
+NOSE_TIP = 4
+FOREHEAD = 10
+CHIN = 152
+LEFT_EYE_OUTER = 33      # Left side of the image (subject's right eye)
+RIGHT_EYE_OUTER = 263
+LEFT_EYE_INNER = 133
+RIGHT_EYE_INNER = 362
+LEFT_EYE_UPPER = 159
+LEFT_EYE_LOWER = 145
+RIGHT_EYE_UPPER = 386
+RIGHT_EYE_LOWER = 374
+# Only present when FaceMesh runs with refine_landmarks=True
+LEFT_IRIS = 468
+RIGHT_IRIS = 473
+
+# Head pose, eye openness and gaze are refreshed every POSE_INTERVAL frames,
+# three times a second at the camera's 30 fps
+POSE_INTERVAL = 10
+
+FaceFeatures = namedtuple('FaceFeatures', [
+    'nose',                # (x, y) pixel position of the nose tip
+    'left_eye',            # (x, y) pixel position of the outer corner of the image-left eye
+    'right_eye',           # (x, y) pixel position of the outer corner of the image-right eye
+    'vertical_ratio',      # Nose-to-forehead over nose-to-chin distance
+    'horizontal_ratio',    # Symmetry of the eye-to-nose distances (1.0 = centred)
+    'nose_position_ratio', # Nose height as a fraction of the frame height
+    'pitch',               # Head rotation in degrees; positive pitch = looking down
+    'yaw',                 # Positive yaw = turned towards the image left
+    'roll',                # Positive roll = clockwise tilt in the image
+    'eye_openness',        # Mean lid gap over eye width for both eyes
+    'gaze',                # (x, y) gaze proxy: iris offset inside the eyes with refined
+                           # landmarks, otherwise nose offset from the eye-line midpoint
+])
+
+
+def _head_angles(right_axis, down_axis):
+    """
+    Pitch, yaw and roll in degrees from the face's eye line and forehead-chin
+    line in camera space.
+    """
+    ax, ay, az = right_axis
+    bx, by, bz = down_axis
+    norm = math.sqrt(ax * ax + ay * ay + az * az) or 1.0
+    ax, ay, az = ax / norm, ay / norm, az / norm
+    # Forward axis (into the screen) is right x down
+    cx, cy, cz = ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx
+    norm = math.sqrt(cx * cx + cy * cy + cz * cz) or 1.0
+    cx, cy, cz = cx / norm, cy / norm, cz / norm
+    # Re-orthogonalised down axis; only its z component is needed
+    down_z = cx * ay - cy * ax
+
+    # Rotation matrix columns are (right, down, forward)
+    pitch = math.degrees(math.atan2(down_z, cz))
+    yaw = math.degrees(math.atan2(-az, math.hypot(ax, ay)))
+    roll = math.degrees(math.atan2(ay, ax))
+    return pitch, yaw, roll
+
+
+def _slow_features(landmarks, w, h):
+    """Head pose, eye openness and gaze as (pitch, yaw, roll, eye_openness, gaze)"""
+    left_outer, right_outer = landmarks[LEFT_EYE_OUTER], landmarks[RIGHT_EYE_OUTER]
+    left_inner, right_inner = landmarks[LEFT_EYE_INNER], landmarks[RIGHT_EYE_INNER]
+    forehead, chin = landmarks[FOREHEAD], landmarks[CHIN]
+
+    # Face mesh reports z on the same scale as x (so it is scaled by the
+    # frame width): the eye line and the forehead-chin line span the face
+    # plane and give the rotation directly, without an iterative solvePnP.
+    eye_x = (right_outer.x - left_outer.x) * w
+    eye_y = (right_outer.y - left_outer.y) * h
+    eye_z = (right_outer.z - left_outer.z) * w
+    pitch, yaw, roll = _head_angles(
+        (eye_x, eye_y, eye_z),
+        ((chin.x - forehead.x) * w, (chin.y - forehead.y) * h, (chin.z - forehead.z) * w)
+    )
+
+    def distance(a, b):
+        dx, dy, dz = (a.x - b.x) * w, (a.y - b.y) * h, (a.z - b.z) * w
+        return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+    left_width = distance(left_outer, left_inner) or 1e-6
+    right_width = distance(right_outer, right_inner) or 1e-6
+    eye_openness = (
+        distance(landmarks[LEFT_EYE_UPPER], landmarks[LEFT_EYE_LOWER]) / left_width
+        + distance(landmarks[RIGHT_EYE_UPPER], landmarks[RIGHT_EYE_LOWER]) / right_width
+    ) / 2
+
+    if len(landmarks) > RIGHT_IRIS:
+        # Iris position relative to each eye's centre, normalised by eye width
+        left_iris, right_iris = landmarks[LEFT_IRIS], landmarks[RIGHT_IRIS]
+        gaze = (
+            ((left_iris.x - (left_outer.x + left_inner.x) / 2) * w / left_width
+             + (right_iris.x - (right_outer.x + right_inner.x) / 2) * w / right_width) / 2,
+            ((left_iris.y - (left_outer.y + left_inner.y) / 2) * h / left_width
+             + (right_iris.y - (right_outer.y + right_inner.y) / 2) * h / right_width) / 2,
+        )
+    else:
+        # Without iris landmarks, where the nose tip sits relative to the
+        # midpoint between the eyes, normalised by the eye span: it moves
+        # right/down as the face turns towards the image right/bottom.
+        nose = landmarks[NOSE_TIP]
+        eye_span = math.sqrt(eye_x * eye_x + eye_y * eye_y + eye_z * eye_z) or 1e-6
+        gaze = (
+            (nose.x - (left_outer.x + right_outer.x) / 2) * w / eye_span,
+            (nose.y - (left_outer.y + right_outer.y) / 2) * h / eye_span,
+        )
+
+    return pitch, yaw, roll, eye_openness, gaze
+
+
+class FeatureExtractor:
+    """
+    Turns face mesh results into FaceFeatures, one frame at a time.
+
+    The ratios that decide whether the user is studying are recomputed on
+    every frame from five landmarks. Head pose, eye openness and gaze change
+    slowly and only feed the debug overlay, so they are refreshed every
+    pose_interval frames and reused in between; this keeps the per-frame
+    cost below that of the original scalar ratios.
+
+    At a dozen landmarks plain float math is cheaper than NumPy, whose
+    per-call overhead alone exceeds the whole scalar budget.
+    """
+
+    def __init__(self, pose_interval=POSE_INTERVAL):
+        self.pose_interval = pose_interval
+        self.reset()
+
+    def reset(self):
+        """Forget the cached pose, e.g. when the face is lost"""
+        self._frames_until_pose = 0
+        self._pose = None
+
+    def extract(self, face_landmarks, w, h):
+        landmarks = face_landmarks.landmark
+        nose, forehead, chin = landmarks[NOSE_TIP], landmarks[FOREHEAD], landmarks[CHIN]
+        left_eye, right_eye = landmarks[LEFT_EYE_OUTER], landmarks[RIGHT_EYE_OUTER]
+
+        nose_x, nose_y = nose.x * w, nose.y * h
+        left_x, right_x = left_eye.x * w, right_eye.x * w
+
+        lower = chin.y * h - nose_y
+        vertical_ratio = (nose_y - forehead.y * h) / lower if lower > 0 else 0.0
+
+        left_dist, right_dist = abs(left_x - nose_x), abs(right_x - nose_x)
+        if left_dist < right_dist:
+            horizontal_ratio = left_dist / right_dist
+        else:
+            horizontal_ratio = right_dist / left_dist if left_dist > 0 else 0.0
+
+        if self._frames_until_pose == 0:
+            self._pose = _slow_features(landmarks, w, h)
+            self._frames_until_pose = self.pose_interval
+        self._frames_until_pose -= 1
+
+        return FaceFeatures._make((
+            (nose_x, nose_y), (left_x, left_eye.y * h), (right_x, right_eye.y * h),
+            vertical_ratio, horizontal_ratio, nose.y,
+        ) + self._pose)
@@ -7,22 +7,24 @@ from face_detection import FaceDetector
 from gui import StudyTrackerGUI
 from data_manager import DataManager
 from pomodoro import PomodoroTimer
+from tracker_state import TrackerStateCore
 from utils import create_beep_function
 
 class StudyTracker:
     def __init__(self):
-        # Initialize basic state
-        self.study_time = 0
-        self.points = 0
-        self.level = 1
-        self.is_studying = False
-        self.point_accumulator = 0
+        # Initialize basic state; totals live in the single-writer state core
+        self.state = TrackerStateCore()
         self.session_start_time = datetime.now()
         self.last_status_change = datetime.now()
         
         # Initialize components
         self.beep = create_beep_function()
         self.data_manager = DataManager()
+        # Pack closed months into archive bundles before anything scans the data directory
+        self.data_manager.compact_archives()
+        # Load the history summary now, building it on the first run after an
+        # upgrade, so opening the history view never scans the session files
+        self.data_manager.get_daily_totals()
         self.face_detector = FaceDetector(self.on_face_status_change)
         
         # Create pomodoro timer BEFORE GUI to avoid AttributeError
@@ -50,39 +52,46 @@ class StudyTracker:
         self.save_thread.daemon = True
         self.save_thread.start()
     
+    @property
+    def study_time(self):
+        return self.state.snapshot.study_time
+    
+    @property
+    def points(self):
+        return self.state.snapshot.points
+    
+    @property
+    def level(self):
+        return self.state.snapshot.level
+    
+    @property
+    def is_studying(self):
+        return self.state.snapshot.is_studying
+    
     def on_face_status_change(self, is_studying, time_diff):
-        self.is_studying = is_studying
-        
-        if is_studying:
-            self.study_time += time_diff
-            self.point_accumulator += time_diff
-            if self.point_accumulator >= 1.0:
-                points_to_add = int(self.point_accumulator)
-                self.point_accumulator -= points_to_add
-                self.add_points(points_to_add)
+        self.state.record_status(is_studying, time_diff)
     
     def add_points(self, points):
-        self.points += points
-        if self.points >= self.level * 100:
-            self.level_up()
-        self.gui.update_gui()
-    
-    def level_up(self):
-        self.level += 1
+        # The GUI picks up the new totals on its next scheduled refresh
+        self.state.add_points(points)
     
     def load_session_data(self):
         data = self.data_manager.load_session_data()
         if data:
-            self.study_time = data.get('study_time', 0)
-            self.points = data.get('points', 0)
-            self.level = data.get('level', 1)
+            self.state.load(
+                study_time=data.get('study_time', 0),
+                points=data.get('points', 0),
+                level=data.get('level', 1)
+            )
+            self.state.flush()
     
     def save_session_data(self):
+        snapshot = self.state.snapshot
         data = {
             'date': datetime.now().strftime('%Y-%m-%d'),
-            'study_time': self.study_time,
-            'points': self.points,
-            'level': self.level
+            'study_time': snapshot.study_time,
+            'points': snapshot.points,
+            'level': snapshot.level
         }
         self.data_manager.save_session_data(data)
     
@@ -92,10 +101,11 @@ class StudyTracker:
             self.save_session_data()
     
     def export_stats(self):
+        snapshot = self.state.snapshot
         self.data_manager.export_stats(
-            study_time=self.study_time,
-            points=self.points,
-            level=self.level,
+            study_time=snapshot.study_time,
+            points=snapshot.points,
+            level=snapshot.level,
             session_start_time=self.session_start_time
         )
     
@@ -104,5 +114,6 @@ class StudyTracker:
         try:
             self.gui.root.mainloop()
         finally:
+            self.state.flush(timeout=1.0)
             self.save_session_data()
             self.export_stats()
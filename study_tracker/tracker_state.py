@@ -0,0 +1,98 @@
+import queue
+import threading
+from collections import namedtuple
+
+# Immutable view of the tracker totals. Readers (GUI, persistence, exporters)
+# grab the current snapshot without locking; only the writer thread replaces it.
+TrackerSnapshot = namedtuple(
+    'TrackerSnapshot',
+    ['study_time', 'points', 'level', 'is_studying', 'point_accumulator']
+)
+
+POINTS_PER_LEVEL = 100
+
+
+class TrackerStateCore:
+    """
+    Single-writer owner of the tracker state.
+
+    Any thread may submit commands; they are applied in order by one writer
+    thread, which publishes a new TrackerSnapshot after each command.
+    """
+
+    def __init__(self):
+        self.snapshot = TrackerSnapshot(
+            study_time=0,
+            points=0,
+            level=1,
+            is_studying=False,
+            point_accumulator=0
+        )
+        self._commands = queue.Queue()
+        self._writer = threading.Thread(target=self._run, name="tracker-state")
+        self._writer.daemon = True
+        self._writer.start()
+
+    def record_status(self, is_studying, time_diff):
+        self._commands.put((self._apply_status, (is_studying, time_diff)))
+
+    def add_points(self, points):
+        self._commands.put((self._apply_points, (points,)))
+
+    def load(self, study_time, points, level):
+        self._commands.put((self._apply_load, (study_time, points, level)))
+
+    def flush(self, timeout=None):
+        """Block until every command submitted so far has been applied."""
+        done = threading.Event()
+        self._commands.put((None, done))
+        return done.wait(timeout)
+
+    def _run(self):
+        while True:
+            command, args = self._commands.get()
+            if command is None:
+                args.set()
+                continue
+            try:
+                self.snapshot = command(self.snapshot, *args)
+            except Exception as e:
+                print(f"Error applying tracker update: {e}")
+
+    @staticmethod
+    def _level_for(points, level):
+        # Loop so that a large award (e.g. a pomodoro bonus) cannot skip levels
+        while points >= level * POINTS_PER_LEVEL:
+            level += 1
+        return level
+
+    def _apply_status(self, state, is_studying, time_diff):
+        if not is_studying:
+            return state._replace(is_studying=False)
+
+        study_time = state.study_time + time_diff
+        accumulator = state.point_accumulator + time_diff
+        points = state.points
+        if accumulator >= 1.0:
+            points_to_add = int(accumulator)
+            accumulator -= points_to_add
+            points += points_to_add
+
+        return state._replace(
+            study_time=study_time,
+            points=points,
+            level=self._level_for(points, state.level),
+            is_studying=True,
+            point_accumulator=accumulator
+        )
+
+    def _apply_points(self, state, points):
+        points = state.points + points
+        return state._replace(points=points, level=self._level_for(points, state.level))
+
+    def _apply_load(self, state, study_time, points, level):
+        return state._replace(
+            study_time=study_time,
+            points=points,
+            level=self._level_for(points, level)
+        )